@@ -1,10 +1,15 @@
 import streamlit as st
+import numpy as np
+import pandas as pd
 from reportlab.lib.pagesizes import letter
 from reportlab.pdfgen import canvas
 from reportlab.lib import colors
 import io
 from datetime import datetime
 
+# Average ApeX fee per unit of trading volume
+AVERAGE_APEX_FEE = 0.000475
+
 # Helper functions
 def format_number(num):
     return "{:,.2f}".format(num)
@@ -18,6 +23,54 @@ def parse_number(num_str):
     except ValueError:
         return 0.0
 
+def calculate_roi(volume, budget, aff_commission, master_aff_commission):
+    # Fee split and ROI for a deal; works on single values and on pandas columns alike
+    total_trading_fee = volume * AVERAGE_APEX_FEE
+    generated_affiliate_commission = total_trading_fee * aff_commission
+    generated_master_affiliate_commission = total_trading_fee * master_aff_commission
+    apex_generated_fee = total_trading_fee * (1 - aff_commission - master_aff_commission)
+    total_affiliate_spend = generated_affiliate_commission + generated_master_affiliate_commission + budget
+    # A zero spend divides by infinity instead, which gives an ROI of 0
+    roi = ((apex_generated_fee - budget) / np.where(total_affiliate_spend != 0, total_affiliate_spend, np.inf)) * 100
+    return total_trading_fee, apex_generated_fee, roi
+
+def build_baseline(volume, budget, aff_commission, master_aff_commission):
+    # Baseline record stored for the Scenario tab, computed from the given deal inputs
+    _, apex_generated_fee, roi = calculate_roi(volume, budget, aff_commission, master_aff_commission)
+    return {
+        "target_volume": volume,
+        "budget": budget,
+        "affiliate_commission": aff_commission,
+        "master_affiliate_commission": master_aff_commission,
+        "apex_generated_fee": apex_generated_fee,
+        "roi": roi,
+    }
+
+def evaluate_scenario(baselines, scenario_multiplier):
+    # Apply one combined market multiplier to every baseline at once, one column per field
+    deals = pd.DataFrame.from_dict(baselines, orient="index")
+    expected_volume = deals['target_volume'] * scenario_multiplier
+    _, apex_generated_fee, roi = calculate_roi(
+        expected_volume,
+        deals['budget'],
+        deals['affiliate_commission'],
+        deals['master_affiliate_commission'],
+    )
+
+    return pd.DataFrame({
+        "expected_volume": expected_volume,
+        "apex_generated_fee": apex_generated_fee,
+        "roi": roi,
+    })
+
+def fit_text(c, text, font_name, font_size, max_width):
+    # Trim text with an ellipsis so drawString stays inside the page margins
+    if c.stringWidth(text, font_name, font_size) <= max_width:
+        return text
+    while text and c.stringWidth(text + "...", font_name, font_size) > max_width:
+        text = text[:-1]
+    return text + "..."
+
 def create_pdf(calculations, title):
     buffer = io.BytesIO()
     c = canvas.Canvas(buffer, pagesize=letter)
@@ -54,18 +107,22 @@ def create_pdf(calculations, title):
             # Print section title
             if section != "affiliate_info":  # Skip the affiliate_info title
                 c.setFont("Helvetica-Bold", 14)
-                c.drawString(margin, y_position, section)
+                c.drawString(margin, y_position, fit_text(c, section, "Helvetica-Bold", 14, width - 2 * margin))
                 y_position -= 20
 
             # Print section content
             c.setFont("Helvetica", 12)
             for label, value in calculations[section].items():
+                if y_position < 100:  # Long sections (e.g. many baselines) continue on a new page
+                    c.showPage()
+                    y_position = height - margin
                 # Italicize outputs
                 if "Result" in label or "Commission" in label or "ROI" in label or "Volume" in label:
-                    c.setFont("Helvetica-Oblique", 12)  # Italic font for outputs
+                    font_name = "Helvetica-Oblique"  # Italic font for outputs
                 else:
-                    c.setFont("Helvetica", 12)  # Regular font for inputs
-                c.drawString(margin, y_position, f"{label}: {value}")
+                    font_name = "Helvetica"  # Regular font for inputs
+                c.setFont(font_name, 12)
+                c.drawString(margin, y_position, fit_text(c, f"{label}: {value}", font_name, 12, width - 2 * margin))
                 y_position -= 20
 
             # Add a divider line between sections
@@ -92,6 +149,8 @@ if 'calculations' not in st.session_state:
     st.session_state['calculations'] = {}
 if 'all_calculations_done' not in st.session_state:
     st.session_state['all_calculations_done'] = False
+if 'roi_baselines' not in st.session_state:
+    st.session_state['roi_baselines'] = {}
 
 # Custom CSS styling
 st.markdown("""
@@ -271,7 +330,7 @@ with tab1:
             st.error("Either Bonus or Payments must be greater than zero.")
         else:
             # Calculate Fee Income
-            average_apex_fee = 0.000475
+            average_apex_fee = AVERAGE_APEX_FEE
             fee_income = volume * average_apex_fee
 
             # Calculate Margin Commission as a percentage
@@ -339,7 +398,7 @@ with tab2:
     # Calculate button
     if st.button("Calculate Max (Bonus + Payments)"):
         # Calculate Fee Income
-        average_apex_fee = 0.000475
+        average_apex_fee = AVERAGE_APEX_FEE
         fee_income = volume * average_apex_fee
 
         # Calculate Margin Commission as a percentage
@@ -382,7 +441,7 @@ with tab3:
     aff_commission = st.selectbox("Affiliate Commission:", options=affiliate_commission_options, format_func=lambda x: f"{int(x * 100)}%", key="affiliate_commission_net_zero")
     master_aff_commission = st.selectbox("Master Affiliate Commission:", options=master_affiliate_commission_options, format_func=lambda x: f"{int(x * 100)}%", key="master_affiliate_commission_net_zero")
     
-    average_apex_fee = 0.000475
+    average_apex_fee = AVERAGE_APEX_FEE
 
     # Calculate button
     if st.button("Calculate Net Zero Volume"):
@@ -446,7 +505,7 @@ with tab4:
     aff_commission = st.selectbox("Affiliate Commission:", options=affiliate_commission_options, format_func=lambda x: f"{int(x * 100)}%", key="affiliate_commission_vol_req")
     master_aff_commission = st.selectbox("Master Affiliate Commission:", options=master_affiliate_commission_options, format_func=lambda x: f"{int(x * 100)}%", key="master_affiliate_commission_vol_req")
 
-    average_apex_fee = 0.000475
+    average_apex_fee = AVERAGE_APEX_FEE
 
     # Calculate button
     if st.button("Calculate Volume Requirements"):
@@ -514,31 +573,14 @@ with tab5:
         # Parse inputs
         budget = parse_number(budget_str)
         
-        average_apex_fee = 0.000475
-
         # Standard Calculation
-        # Calculate Total Trading Fee
-        total_trading_fee = target_volume * average_apex_fee
-
-        # Calculate Generated Affiliate and Master Affiliate Commissions
-        generated_affiliate_commission = total_trading_fee * aff_commission
-        generated_master_affiliate_commission = total_trading_fee * master_aff_commission
-
-        # Calculate ApeX Generated Fee
-        apex_generated_fee = total_trading_fee * (1 - aff_commission - master_aff_commission)
+        _, apex_generated_fee, roi = calculate_roi(target_volume, budget, aff_commission, master_aff_commission)
 
-        # Calculate ROI
-        total_affiliate_spend = generated_affiliate_commission + generated_master_affiliate_commission + budget
-        roi = ((apex_generated_fee - budget) / total_affiliate_spend) * 100 if total_affiliate_spend != 0 else 0
-
-        # Store inputs in session_state for use in the scenario tab
+        # Store inputs in session_state so the scenario tab can rebuild this deal as "Current ROI"
         st.session_state['roi_target_volume'] = target_volume
         st.session_state['roi_budget'] = budget
         st.session_state['roi_affiliate_commission'] = aff_commission
         st.session_state['roi_master_affiliate_commission'] = master_aff_commission
-        st.session_state['roi_apex_generated_fee'] = apex_generated_fee
-        st.session_state['roi'] = roi
-        st.session_state['roi_total_trading_fee'] = total_trading_fee
 
         # Standard Result
         st.write("### Standard Calculation")
@@ -558,6 +600,44 @@ with tab5:
             "ROI": f"{format_number(roi)}%"
         }
 
+    # Save the inputs currently on screen as a named baseline for the Scenario tab
+    st.divider()
+    st.write("#### Save as Scenario Baseline")
+    # Default to a numbered name so several deals for one affiliate don't collide
+    baseline_prefix = st.session_state['calculations'].get("affiliate_info", {}).get("Affiliate/KOL Name", "") or "Baseline"
+    baseline_number = len(st.session_state['roi_baselines']) + 1
+    while f"{baseline_prefix} #{baseline_number}" in st.session_state['roi_baselines']:
+        baseline_number += 1
+    default_baseline_name = f"{baseline_prefix} #{baseline_number}"
+    baseline_name = st.text_input("Baseline Name:", value="", placeholder=default_baseline_name, key="baseline_name").strip() or default_baseline_name
+
+    if st.button("Save Baseline", key="save_baseline"):
+        if baseline_name == "Current ROI":
+            st.error("'Current ROI' is reserved for the last ROI calculation. Please choose another name.")
+        elif baseline_name in st.session_state['roi_baselines']:
+            st.error(f"A baseline named '{baseline_name}' already exists. Please choose another name or delete it first.")
+        else:
+            baseline = build_baseline(target_volume, parse_number(budget_str), aff_commission, master_aff_commission)
+            st.session_state['roi_baselines'][baseline_name] = baseline
+            st.success(
+                f"Baseline '{baseline_name}' saved: Volume {format_number(baseline['target_volume'])}, "
+                f"ROI {format_number(baseline['roi'])}%."
+            )
+
+    if st.session_state['roi_baselines']:
+        st.write(f"Saved baselines: {len(st.session_state['roi_baselines'])}")
+        baseline_to_delete = st.selectbox("Saved Baseline:", list(st.session_state['roi_baselines'].keys()), key="baseline_to_delete")
+
+        col1, col2 = st.columns(2)
+        with col1:
+            if st.button("Delete Baseline", key="delete_baseline"):
+                st.session_state['roi_baselines'].pop(baseline_to_delete, None)
+                st.rerun()
+        with col2:
+            if st.button("Clear Baselines", key="clear_baselines"):
+                st.session_state['roi_baselines'] = {}
+                st.rerun()
+
 # Tab 6: Scenario Calculation
 with tab6:
     st.header("Scenario Calculation")
@@ -576,81 +656,107 @@ with tab6:
     """)
     st.divider()
 
-    # Retrieve stored inputs from session_state
+    # Retrieve saved baselines from session_state, plus the last ROI calculation unless it was already saved
+    baselines = dict(st.session_state['roi_baselines'])
     if 'roi_target_volume' in st.session_state:
-        base_volume = st.session_state['roi_target_volume']
-        budget = st.session_state['roi_budget']
-        affiliate_commission = st.session_state['roi_affiliate_commission']
-        master_affiliate_commission = st.session_state['roi_master_affiliate_commission']
-        apex_generated_fee = st.session_state['roi_apex_generated_fee']
-        roi = st.session_state['roi']
+        current_roi = build_baseline(
+            st.session_state['roi_target_volume'],
+            st.session_state['roi_budget'],
+            st.session_state['roi_affiliate_commission'],
+            st.session_state['roi_master_affiliate_commission'],
+        )
+        deal_inputs = ("target_volume", "budget", "affiliate_commission", "master_affiliate_commission")
+        if all(
+            any(saved[field] != current_roi[field] for field in deal_inputs)
+            for saved in baselines.values()
+        ):
+            baselines["Current ROI"] = current_roi
+
+    if not baselines:
+        st.error("Please complete the ROI Calculation tab first, or save one or more baselines there.")
     else:
-        st.error("Please complete the ROI Calculation tab first.")
-        st.stop()
-
-    # Scenario multipliers with descriptions
-    market_sentiment = st.selectbox("Market Sentiment (MS):", ["Positive (1.2)", "Neutral (1.0)", "Negative (0.5)"], index=0, key="market_sentiment")
-    apex_status = st.selectbox("ApeX Status, Liquidity & Pairs (AS):", ["High (1.1)", "Neutral (1.0)", "Low (0.9)"], index=0, key="apex_status")
-    kol_influence = st.selectbox("KOL Influence (KI):", ["High (1.3)", "Neutral (1.0)", "Low (0.7)"], index=2, key="kol_influence")
-    affiliate_engagement = st.selectbox("Affiliate Engagement (AE):", ["High (1.25)", "Neutral (1.0)", "Low (0.75)"], index=1, key="affiliate_engagement")
-
-    # Calculate button
-    if st.button("Calculate Scenario", key="calculate_scenario"):
-        # Define multipliers
-        ms_dict = {"Positive (1.2)": 1.2, "Neutral (1.0)": 1.0, "Negative (0.5)": 0.5}
-        as_dict = {"High (1.1)": 1.1, "Neutral (1.0)": 1.0, "Low (0.9)": 0.9}
-        ki_dict = {"High (1.3)": 1.3, "Neutral (1.0)": 1.0, "Low (0.7)": 0.7}
-        ae_dict = {"High (1.25)": 1.25, "Neutral (1.0)": 1.0, "Low (0.75)": 0.75}
-
-        # Apply selected multipliers
-        ms_multiplier = ms_dict[market_sentiment]
-        as_multiplier = as_dict[apex_status]
-        ki_multiplier = ki_dict[kol_influence]
-        ae_multiplier = ae_dict[affiliate_engagement]
-
-        # Calculate expected volume with scenario multipliers
-        v_expected_scenario = base_volume * ms_multiplier * as_multiplier * ki_multiplier * ae_multiplier
-        total_trading_fee_scenario = v_expected_scenario * 0.000475
-
-        # Calculate Generated Affiliate and Master Affiliate Commissions in Scenario
-        generated_affiliate_commission_scenario = total_trading_fee_scenario * affiliate_commission
-        generated_master_affiliate_commission_scenario = total_trading_fee_scenario * master_affiliate_commission
-
-        # Calculate ApeX Generated Fee in Scenario
-        apex_generated_fee_scenario = total_trading_fee_scenario * (1 - affiliate_commission - master_aff_commission)
-
-        # Calculate ROI in Scenario
-        total_affiliate_spend_scenario = generated_affiliate_commission_scenario + generated_master_affiliate_commission_scenario + budget
-        roi_scenario = ((apex_generated_fee_scenario - budget) / total_affiliate_spend_scenario) * 100 if total_affiliate_spend_scenario != 0 else 0
-
-        st.write("### Comparison with Scenario Multipliers")
-
-        col1, col2 = st.columns(2)
-
-        with col1:
-            st.write("#### Standard Calculation")
-            st.write("**Volume Selected**")
-            st.info(f"{format_number(base_volume)}")
-            st.write("**ApeX Generated Fee**")
-            st.info(f"${format_number(apex_generated_fee)}")
-            st.write("**ROI**")
-            st.info(f"{format_number(roi)}%")
-
-        with col2:
-            st.write("#### Scenario Calculation")
-            st.write("**Expected Volume with Scenario**")
-            st.info(f"{format_number(v_expected_scenario)}")
-            st.write("**ApeX Generated Fee with Scenario**")
-            st.info(f"${format_number(apex_generated_fee_scenario)}")
-            st.write("**ROI with Scenario**")
-            st.info(f"{format_number(roi_scenario)}%")
+        # No key, so the selection resets to every baseline whenever one is saved or deleted
+        selected_baselines = st.multiselect("Baselines to Compare:", list(baselines.keys()), default=list(baselines.keys()))
+        if "Current ROI" in baselines:
+            st.caption("Current ROI is the last calculation from the ROI tab, which has not been saved as a baseline.")
+
+        # Scenario multipliers with descriptions
+        market_sentiment = st.selectbox("Market Sentiment (MS):", ["Positive (1.2)", "Neutral (1.0)", "Negative (0.5)"], index=0, key="market_sentiment")
+        apex_status = st.selectbox("ApeX Status, Liquidity & Pairs (AS):", ["High (1.1)", "Neutral (1.0)", "Low (0.9)"], index=0, key="apex_status")
+        kol_influence = st.selectbox("KOL Influence (KI):", ["High (1.3)", "Neutral (1.0)", "Low (0.7)"], index=2, key="kol_influence")
+        affiliate_engagement = st.selectbox("Affiliate Engagement (AE):", ["High (1.25)", "Neutral (1.0)", "Low (0.75)"], index=1, key="affiliate_engagement")
+
+        # Calculate button
+        if st.button("Calculate Scenario", key="calculate_scenario"):
+            if not selected_baselines:
+                st.error("Please select at least one baseline.")
+            else:
+                # Define multipliers
+                ms_dict = {"Positive (1.2)": 1.2, "Neutral (1.0)": 1.0, "Negative (0.5)": 0.5}
+                as_dict = {"High (1.1)": 1.1, "Neutral (1.0)": 1.0, "Low (0.9)": 0.9}
+                ki_dict = {"High (1.3)": 1.3, "Neutral (1.0)": 1.0, "Low (0.7)": 0.7}
+                ae_dict = {"High (1.25)": 1.25, "Neutral (1.0)": 1.0, "Low (0.75)": 0.75}
+
+                # Combine selected multipliers once for all baselines
+                scenario_multiplier = ms_dict[market_sentiment] * as_dict[apex_status] * ki_dict[kol_influence] * ae_dict[affiliate_engagement]
+
+                compared = {name: baselines[name] for name in selected_baselines}
+                scenario_results = evaluate_scenario(compared, scenario_multiplier)
+
+                st.write("### Comparison with Scenario Multipliers")
+                st.write(f"**Combined Multiplier:** {scenario_multiplier:.4f}")
+
+                # Keep the table numeric so every column sorts by value; formatting is display-only
+                comparison = (
+                    pd.DataFrame.from_dict(compared, orient="index")[["target_volume", "apex_generated_fee", "roi"]]
+                    .join(scenario_results, rsuffix="_scenario")
+                    .rename(columns={
+                        "target_volume": "Volume Selected",
+                        "apex_generated_fee": "ApeX Generated Fee",
+                        "roi": "ROI",
+                        "expected_volume": "Expected Volume with Scenario",
+                        "apex_generated_fee_scenario": "ApeX Generated Fee with Scenario",
+                        "roi_scenario": "ROI with Scenario",
+                    })
+                    .rename_axis("Baseline")
+                    .reset_index()
+                )
+                st.dataframe(
+                    comparison,
+                    hide_index=True,
+                    width="stretch",
+                    column_config={
+                        "Volume Selected": st.column_config.NumberColumn(format="accounting"),
+                        "ApeX Generated Fee": st.column_config.NumberColumn(format="dollar"),
+                        "ROI": st.column_config.NumberColumn(format="%.2f%%"),
+                        "Expected Volume with Scenario": st.column_config.NumberColumn(format="accounting"),
+                        "ApeX Generated Fee with Scenario": st.column_config.NumberColumn(format="dollar"),
+                        "ROI with Scenario": st.column_config.NumberColumn(format="%.2f%%"),
+                    },
+                )
 
-        # Store the result in session state
-        st.session_state['calculations']["Scenario Calculation"] = {
-            "Volume Selected": f"{format_number(base_volume)}",
-            "ApeX Generated Fee with Scenario": f"${format_number(apex_generated_fee_scenario)}",
-            "ROI with Scenario": f"{format_number(roi_scenario)}%"
-        }
+                # Store the result in session state: the scenario inputs, then one section per baseline
+                # Drop the previous run first so its header and per-baseline sections are re-added together at the end
+                for section in [key for key in st.session_state['calculations'] if key == "Scenario Calculation" or key.startswith("Scenario: ")]:
+                    del st.session_state['calculations'][section]
+
+                st.session_state['calculations']["Scenario Calculation"] = {
+                    "Market Sentiment (MS)": market_sentiment,
+                    "ApeX Status, Liquidity & Pairs (AS)": apex_status,
+                    "KOL Influence (KI)": kol_influence,
+                    "Affiliate Engagement (AE)": affiliate_engagement,
+                    "Combined Multiplier": f"{scenario_multiplier:.4f}",
+                    "Baselines Compared": f"{len(compared)}"
+                }
+                for row in comparison.to_dict(orient="records"):
+                    st.session_state['calculations'][f"Scenario: {row['Baseline']}"] = {
+                        "Volume Selected": f"{format_number(row['Volume Selected'])}",
+                        "ApeX Generated Fee": f"${format_number(row['ApeX Generated Fee'])}",
+                        "ROI": f"{format_number(row['ROI'])}%",
+                        "Expected Volume with Scenario": f"{format_number(row['Expected Volume with Scenario'])}",
+                        "ApeX Generated Fee with Scenario": f"${format_number(row['ApeX Generated Fee with Scenario'])}",
+                        "ROI with Scenario": f"{format_number(row['ROI with Scenario'])}%"
+                    }
 
 # Remove all individual print buttons and add a single print button at the end
 if st.session_state['calculations']: